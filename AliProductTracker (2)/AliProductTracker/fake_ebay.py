@@ -0,0 +1,110 @@
+"""
+Local fake-eBay server for load testing the scraper without hitting ebay.com.
+
+Serves saved search result pages for /sch/i.html with configurable latency,
+error rate and 429 throttling. Point the scraper at it with
+ProductScraper(base_url=...) or the SCRAPER_BASE_URL environment variable.
+
+    python fake_ebay.py --port 5001 --latency 0.3 --error-rate 0.05 --throttle-rate 0.1
+"""
+import argparse
+import logging
+import os
+import random
+import threading
+import time
+
+from flask import Flask, request, abort
+
+DEFAULT_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'debug_page_gym_equipment.html')
+
+
+def create_app(pages=None, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0,
+               retry_after=1, seed=None):
+    """
+    Build the stub app. Page N of a search is served from pages[(N - 1) % len(pages)]
+    """
+    pages = pages or [DEFAULT_PAGE]
+    page_bodies = []
+    for path in pages:
+        with open(path, 'r', encoding='utf-8') as f:
+            page_bodies.append(f.read())
+
+    # Seeded so that a run with the same settings injects the same faults
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+
+    stub = Flask(__name__)
+    stub.config['FAKE_EBAY_STATS'] = stats = {'requests': 0, 'ok': 0, 'errors': 0, 'throttled': 0}
+
+    @stub.route('/sch/i.html')
+    def search():
+        """Fake eBay search results page"""
+        with rng_lock:
+            stats['requests'] += 1
+            delay = max(0.0, latency + rng.uniform(-jitter, jitter))
+            roll = rng.random()
+
+        if delay:
+            time.sleep(delay)
+
+        if roll < throttle_rate:
+            with rng_lock:
+                stats['throttled'] += 1
+            return 'Too Many Requests', 429, {'Retry-After': str(retry_after)}
+
+        if roll < throttle_rate + error_rate:
+            with rng_lock:
+                stats['errors'] += 1
+            return 'Internal Server Error', 500
+
+        try:
+            page = int(request.args.get('_pgn', 1))
+        except ValueError:
+            abort(400)
+
+        with rng_lock:
+            stats['ok'] += 1
+        return page_bodies[(max(page, 1) - 1) % len(page_bodies)], 200, {'Content-Type': 'text/html; charset=utf-8'}
+
+    @stub.route('/stats')
+    def fake_stats():
+        """Request counters, handy for checking the injected fault mix"""
+        with rng_lock:
+            return dict(stats)
+
+    return stub
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local fake-eBay server for load testing')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5001)
+    parser.add_argument('--page', action='append', dest='pages',
+                        help='Saved results page to serve (repeat to rotate by page number)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Mean response delay in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='+/- random spread on the delay in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After header sent with 429s')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for repeatable fault injection')
+    args = parser.parse_args()
+
+    if args.error_rate + args.throttle_rate > 1:
+        parser.error('--error-rate and --throttle-rate must add up to at most 1')
+
+    logging.basicConfig(level=logging.INFO)
+    stub = create_app(
+        pages=args.pages,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    stub.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,297 @@
+"""
+End-to-end load test: fires N concurrent /api/search jobs and reports jobs/min,
+p50/p95/p99 job latency, DB write time and memory.
+
+By default everything runs in-process against a fresh SQLite database: the fake
+eBay stub (fake_ebay.py) and the Flask app are started on ephemeral ports and the
+scraper is pointed at the stub via SCRAPER_BASE_URL.
+
+    python load_test.py --jobs 50 --concurrency 10 --latency 0.3 --throttle-rate 0.05 --json baseline.json
+
+Use --target to drive an app that is already running (started with
+SCRAPER_BASE_URL pointing at `python fake_ebay.py`). DB write time and memory
+are only measured in-process.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import fake_ebay
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def start_server(wsgi_app):
+    """Serve a WSGI app on an ephemeral local port in a daemon thread"""
+    from werkzeug.serving import make_server
+
+    server = make_server('127.0.0.1', 0, wsgi_app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+class CommitTimer:
+    """Collects the duration of every ORM session commit (flush + DB commit)"""
+
+    def __init__(self):
+        self.durations = []
+        self._lock = threading.Lock()
+
+    def install(self):
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+
+        event.listen(Session, 'before_commit', self._before_commit)
+        event.listen(Session, 'after_commit', self._after_commit)
+
+    def _before_commit(self, session):
+        session.info['load_test_commit_start'] = time.perf_counter()
+
+    def _after_commit(self, session):
+        start = session.info.pop('load_test_commit_start', None)
+        if start is not None:
+            with self._lock:
+                self.durations.append(time.perf_counter() - start)
+
+
+def run_job(base_url, query, max_pages, poll_interval, timeout):
+    """Submit one job through /api/search and wait for it to finish"""
+    http = requests.Session()
+    start = time.perf_counter()
+    try:
+        response = http.post(f'{base_url}/api/search', json={'query': query, 'max_pages': max_pages}, timeout=30)
+        response.raise_for_status()
+        job_id = response.json()['job_id']
+
+        while time.perf_counter() - start < timeout:
+            job = http.get(f'{base_url}/api/job/{job_id}/status', timeout=30).json()
+            if job['status'] in ('completed', 'failed'):
+                return {
+                    'job_id': job_id,
+                    'status': job['status'],
+                    'latency': time.perf_counter() - start,
+                    'product_count': job.get('product_count', 0),
+                    'error_message': job.get('error_message'),
+                }
+            time.sleep(poll_interval)
+
+        return {'job_id': job_id, 'status': 'timeout', 'latency': time.perf_counter() - start}
+
+    except (requests.RequestException, ValueError, KeyError) as e:
+        return {'job_id': None, 'status': 'submit_error', 'latency': time.perf_counter() - start, 'error_message': str(e)}
+    finally:
+        http.close()
+
+
+def run_load(base_url, args):
+    """Fire args.jobs jobs, at most args.concurrency at a time"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [
+            pool.submit(run_job, base_url, f'{args.query} {i}', args.max_pages, args.poll_interval, args.timeout)
+            for i in range(args.jobs)
+        ]
+        results = [future.result() for future in futures]
+    return results, time.perf_counter() - start
+
+
+def summarize(results, wall_time, commit_durations=None, rss_before=None, rss_after=None, stub_stats=None):
+    """Build the report dict from raw job results"""
+    completed = [r for r in results if r['status'] == 'completed']
+    latencies = [r['latency'] for r in completed]
+
+    report = {
+        'jobs': len(results),
+        'completed': len(completed),
+        'failed': sum(1 for r in results if r['status'] == 'failed'),
+        'timed_out': sum(1 for r in results if r['status'] == 'timeout'),
+        'submit_errors': sum(1 for r in results if r['status'] == 'submit_error'),
+        'completed_with_page_errors': sum(1 for r in completed if r.get('error_message')),
+        'products': sum(r.get('product_count', 0) for r in completed),
+        'wall_time_s': wall_time,
+        'jobs_per_min': len(completed) / wall_time * 60 if wall_time else None,
+        'latency_p50_s': percentile(latencies, 50),
+        'latency_p95_s': percentile(latencies, 95),
+        'latency_p99_s': percentile(latencies, 99),
+        'latency_max_s': max(latencies) if latencies else None,
+    }
+
+    if commit_durations is not None:
+        report.update({
+            'db_commits': len(commit_durations),
+            'db_write_total_s': sum(commit_durations),
+            'db_write_p50_ms': _ms(percentile(commit_durations, 50)),
+            'db_write_p95_ms': _ms(percentile(commit_durations, 95)),
+            'db_write_max_ms': _ms(max(commit_durations) if commit_durations else None),
+        })
+
+    if rss_after is not None:
+        report['peak_rss_mb_before'] = rss_before
+        report['peak_rss_mb'] = rss_after
+
+    if stub_stats is not None:
+        report['stub'] = dict(stub_stats)
+
+    return report
+
+
+def _ms(seconds):
+    return seconds * 1000 if seconds is not None else None
+
+
+def print_report(report):
+    def fmt(value, unit=''):
+        if value is None:
+            return 'n/a'
+        if isinstance(value, float):
+            return f'{value:.3f}{unit}'
+        return f'{value}{unit}'
+
+    print('Load test results')
+    print(f"  jobs:            {report['jobs']} ({report['completed']} completed, {report['failed']} failed, "
+          f"{report['timed_out']} timed out, {report['submit_errors']} submit errors)")
+    print(f"  page errors:     {report['completed_with_page_errors']} completed jobs hit a failed page")
+    print(f"  products:        {report['products']}")
+    print(f"  wall time:       {fmt(report['wall_time_s'], 's')}")
+    print(f"  throughput:      {fmt(report['jobs_per_min'])} jobs/min")
+    print(f"  job latency:     p50 {fmt(report['latency_p50_s'], 's')}  p95 {fmt(report['latency_p95_s'], 's')}  "
+          f"p99 {fmt(report['latency_p99_s'], 's')}  max {fmt(report['latency_max_s'], 's')}")
+    if 'db_commits' in report:
+        print(f"  DB writes:       {report['db_commits']} commits, total {fmt(report['db_write_total_s'], 's')}  "
+              f"p50 {fmt(report['db_write_p50_ms'], 'ms')}  p95 {fmt(report['db_write_p95_ms'], 'ms')}  "
+              f"max {fmt(report['db_write_max_ms'], 'ms')}")
+    if 'peak_rss_mb' in report:
+        print(f"  memory:          peak RSS {fmt(report['peak_rss_mb'], ' MB')} "
+              f"(was {fmt(report['peak_rss_mb_before'], ' MB')} before load)")
+    if 'stub' in report:
+        stub = report['stub']
+        print(f"  fake eBay:       {stub['requests']} requests, {stub['ok']} ok, "
+              f"{stub['errors']} errors, {stub['throttled']} throttled")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end load test for the /api/search pipeline')
+    parser.add_argument('--jobs', type=int, default=20, help='Total number of jobs to submit')
+    parser.add_argument('--concurrency', type=int, default=None, help='Jobs in flight at once (default: all)')
+    parser.add_argument('--max-pages', type=int, default=1,
+                        help='Pages per job (the scraper sleeps 2-4s between pages)')
+    parser.add_argument('--query', default='load test', help='Search term prefix; the job index is appended')
+    parser.add_argument('--poll-interval', type=float, default=0.25, help='Seconds between status polls')
+    parser.add_argument('--timeout', type=float, default=300, help='Per-job timeout in seconds')
+    parser.add_argument('--target', default=None,
+                        help='Base URL of an already running app; skips the in-process app and stub')
+    parser.add_argument('--json', dest='json_path', default=None, help='Also write the report to this file')
+    parser.add_argument('--log-level', default='WARNING', help='Log level for the app under test')
+
+    stub_options = parser.add_argument_group('fake eBay (in-process mode only)')
+    stub_options.add_argument('--page', action='append', dest='pages', help='Saved results page to serve')
+    stub_options.add_argument('--latency', type=float, default=0.0)
+    stub_options.add_argument('--jitter', type=float, default=0.0)
+    stub_options.add_argument('--error-rate', type=float, default=0.0)
+    stub_options.add_argument('--throttle-rate', type=float, default=0.0)
+    stub_options.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    if not 1 <= args.max_pages <= 10:
+        parser.error('--max-pages must be between 1 and 10')
+    if args.error_rate + args.throttle_rate > 1:
+        parser.error('--error-rate and --throttle-rate must add up to at most 1')
+    args.concurrency = args.concurrency or args.jobs
+
+    if args.target:
+        logging.basicConfig(level=args.log_level)
+        results, wall_time = run_load(args.target.rstrip('/'), args)
+        report = summarize(results, wall_time)
+    else:
+        report = run_in_process(args)
+
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+def run_in_process(args):
+    """Run the stub and the real app in this process against a throwaway database"""
+    stub = fake_ebay.create_app(
+        pages=[os.path.abspath(p) for p in args.pages] if args.pages else None,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        seed=args.seed,
+    )
+    stub_server, stub_url = start_server(stub)
+
+    workdir = tempfile.mkdtemp(prefix='load_test_')
+    # app.py reads these at import time, so they must be set before importing it
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'load_test.db')
+    os.environ['SCRAPER_BASE_URL'] = stub_url
+    # The scraper writes a debug_page_*.html per job into the working directory
+    os.chdir(workdir)
+
+    from app import app as flask_app
+
+    logging.getLogger().setLevel(args.log_level)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    commit_timer = CommitTimer()
+    commit_timer.install()
+    app_server, app_url = start_server(flask_app)
+
+    try:
+        rss_before = peak_rss_mb()
+        results, wall_time = run_load(app_url, args)
+        rss_after = peak_rss_mb()
+    finally:
+        app_server.shutdown()
+        stub_server.shutdown()
+
+    print(f'Database and debug pages left in {workdir}')
+    return summarize(
+        results,
+        wall_time,
+        commit_durations=commit_timer.durations,
+        rss_before=rss_before,
+        rss_after=rss_after,
+        stub_stats=stub.config['FAKE_EBAY_STATS'],
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -4,13 +4,14 @@ import time
 import random
 import logging
 import re
+import os
 from urllib.parse import urljoin, quote
 from app import db
 from models import ScrapingJob, Product
 from datetime import datetime
 
 class ProductScraper:
-    def __init__(self):
+    def __init__(self, base_url=None):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -28,7 +29,9 @@ class ProductScraper:
             'Sec-Fetch-Site': 'none',
             'Sec-Fetch-User': '?1',
         })
-        self.base_url = 'https://www.ebay.com'  # Switch to eBay which is more scraper-friendly
+        # Switch to eBay which is more scraper-friendly. Override with base_url or
+        # SCRAPER_BASE_URL to point at a local stub (see fake_ebay.py)
+        self.base_url = (base_url or os.environ.get('SCRAPER_BASE_URL', 'https://www.ebay.com')).rstrip('/')
         self.min_delay = 2  # Respectful delay
         self.max_delay = 4  # Respectful delay
         